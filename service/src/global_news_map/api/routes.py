@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 
 from global_news_map.models.schemas import (
     GameResultsResponse,
@@ -10,11 +10,19 @@ from global_news_map.models.schemas import (
     NewsResponse,
 )
 from global_news_map.services import game as game_service
-from global_news_map.services.locations import get_all_locations, get_location_by_id
-from global_news_map.services.news import get_headlines
+from global_news_map.services.locations import (
+    get_location_by_id,
+    get_locations_body,
+    get_locations_etag,
+)
+from global_news_map.services.news import get_cache_max_age, get_headlines
+from global_news_map.utils.etag import compute_etag, etag_matches
 
 router = APIRouter(prefix="/api")
 
+# Locations only change on restart, so clients may cache them for a day
+LOCATIONS_MAX_AGE_SECONDS = 86400
+
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
@@ -22,12 +30,18 @@ async def health_check():
 
 
 @router.get("/locations", response_model=list[Location])
-async def list_locations():
-    return get_all_locations()
+async def list_locations(request: Request):
+    # Locations are immutable after startup, so serve the body serialized at load time
+    etag = get_locations_etag()
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={LOCATIONS_MAX_AGE_SECONDS}"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=get_locations_body(), media_type="application/json", headers=headers)
 
 
 @router.get("/news/{location_id}", response_model=NewsResponse)
-async def get_news(location_id: str):
+async def get_news(location_id: str, request: Request):
     location = get_location_by_id(location_id)
     if not location:
         raise HTTPException(status_code=404, detail=f"Location '{location_id}' not found")
@@ -36,12 +50,25 @@ async def get_news(location_id: str):
     if not headlines:
         raise HTTPException(status_code=503, detail="Unable to fetch news at this time")
 
-    return NewsResponse(
+    # Both the location and the headlines were validated when they were loaded
+    # or fetched, so skip re-running validation on every request
+    body = NewsResponse.model_construct(
         location_id=location.location_id,
         city=location.city,
         country=location.country,
         headlines=headlines,
-    )
+    ).model_dump_json().encode()
+
+    etag = compute_etag(body)
+    headers = {
+        "ETag": etag,
+        # Only for as long as the server-side entry has left, not the full TTL
+        "Cache-Control": f"public, max-age={get_cache_max_age(headlines)}",
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 # Game endpoints
@@ -65,10 +92,19 @@ async def submit_guess(game_id: str, guess: GuessRequest):
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/game/{game_id}/guesses", response_model=list[GuessResponse])
+async def submit_guesses(game_id: str, guesses: list[GuessRequest]):
+    """Submit guesses for several consecutive rounds at once."""
+    try:
+        return await game_service.submit_guesses(game_id, guesses)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/game/{game_id}/next")
 async def get_next_round(game_id: str):
     """Get the next round's headline after completing a round."""
-    next_round = game_service.get_next_round(game_id)
+    next_round = await game_service.get_next_round(game_id)
     if not next_round:
         raise HTTPException(status_code=404, detail="Game completed or not found")
     return next_round
@@ -78,6 +114,6 @@ async def get_next_round(game_id: str):
 async def get_results(game_id: str):
     """Get final game statistics."""
     try:
-        return game_service.get_game_results(game_id)
+        return await game_service.get_game_results(game_id)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
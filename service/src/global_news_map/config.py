@@ -5,6 +5,15 @@ class Settings(BaseSettings):
     news_api_key: str = ""
     cache_ttl_minutes: int = 120  # 2 hours - reduced API calls while still keeping headlines fresh
     locations_file: str = "data/locations.json"
+    # Fetch headlines for all locations at startup and refresh before expiry.
+    # Unset means on only with Redis, where one worker warms the cache for all
+    prewarm_cache: bool | None = None
+    # In-memory session capacity; oldest games are evicted beyond this
+    max_game_sessions: int = 10000
+    # Race NewsData.io against Google News RSS on cache misses; each miss costs NewsData.io quota
+    race_news_sources: bool = False
+    # e.g. redis://localhost:6379/0 - shares the news cache and game sessions across workers
+    redis_url: str = ""
 
     model_config = {"env_prefix": "", "env_file": ".env"}
 
@@ -1,30 +1,79 @@
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
+import httpx
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from redis.asyncio import Redis
 
 from global_news_map.api.routes import router
 from global_news_map.config import settings
-from global_news_map.services.locations import load_locations
+from global_news_map.services import game, news
+from global_news_map.services.locations import get_all_locations, load_locations
+from global_news_map.utils import distance
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     load_locations(settings.locations_file)
+    distance.warm_up()
+
+    http_client = httpx.AsyncClient(
+        http2=True,
+        follow_redirects=True,
+        timeout=10,
+        limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+    )
+    news.set_http_client(http_client)
+
+    redis_client = None
+    if settings.redis_url:
+        redis_client = Redis.from_url(settings.redis_url)
+        news.set_redis_client(redis_client)
+        game.set_redis_client(redis_client)
+        logger.info("Using Redis for the shared news cache and game sessions")
+
+    # Without Redis every worker would fetch every location on its own, so
+    # warming defaults to off unless explicitly enabled
+    prewarm = settings.prewarm_cache
+    if prewarm is None:
+        prewarm = redis_client is not None
+
+    cache_warmer = None
+    if prewarm:
+        # Runs in the background so startup isn't blocked on upstream fetches
+        cache_warmer = asyncio.create_task(news.keep_cache_warm(get_all_locations()))
+
     yield
 
+    if cache_warmer is not None:
+        cache_warmer.cancel()
+        with suppress(asyncio.CancelledError):
+            await cache_warmer
+
+    if redis_client is not None:
+        news.set_redis_client(None)
+        game.set_redis_client(None)
+        await redis_client.aclose()
+
+    news.set_http_client(None)
+    await http_client.aclose()
+
 
 app = FastAPI(
     title="Global News Map API",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
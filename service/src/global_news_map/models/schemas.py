@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
@@ -39,7 +40,12 @@ class HealthResponse(BaseModel):
 # Game-related models
 
 
-class GameRound(BaseModel):
+# GameRound and GameSession are internal state, never returned from the API
+# directly, so they are slotted dataclasses rather than validated models
+
+
+@dataclass(slots=True)
+class GameRound:
     """Represents a single round in a game session."""
     round_number: int
     headline_title: str
@@ -51,7 +57,8 @@ class GameRound(BaseModel):
     completed: bool = False
 
 
-class GameSession(BaseModel):
+@dataclass(slots=True)
+class GameSession:
     """Represents a complete game session with 5 rounds."""
     game_id: str
     rounds: list[GameRound]
@@ -1,11 +1,21 @@
 """Game service for managing guessing game sessions."""
 
+import asyncio
+import heapq
 import logging
 import random
-import uuid
-from datetime import datetime, timedelta, timezone
-from typing import Optional
-
+import secrets
+import string
+import time
+from collections.abc import Callable, Sequence
+from datetime import datetime, timezone
+from typing import Optional, TypeVar
+
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import WatchError
+
+from global_news_map.config import settings
 from global_news_map.models.schemas import (
     GameResultsResponse,
     GameRound,
@@ -15,14 +25,89 @@ from global_news_map.models.schemas import (
     GuessResponse,
 )
 from global_news_map.services.locations import get_all_locations, get_location_by_id
-from global_news_map.services.news import get_headlines
+from global_news_map.services.news import get_fetch_success_rates, get_headlines
 from global_news_map.utils.distance import calculate_score, haversine_distance
 
 logger = logging.getLogger(__name__)
 
-# In-memory session storage
+T = TypeVar("T")
+
+# In-memory session storage, used when Redis is not configured
 _game_sessions: dict[str, GameSession] = {}
 
+# Min-heap of (expiry timestamp, game_id) so cleanup only touches expired sessions
+_expiry_heap: list[tuple[float, str]] = []
+
+# Optional Redis session storage shared by all workers, set up in the app lifespan
+_redis: Redis | None = None
+
+# Sessions expire one hour after the game starts
+SESSION_TTL_SECONDS = 3600
+
+# Attempts at the optimistic WATCH/MULTI update before giving up on a guess
+_MAX_GUESS_ATTEMPTS = 5
+
+# Dedicated RNG for game setup, independent of the shared module-level random state
+_rng = random.Random()
+
+# Number of locations to fetch per game; extra ones cover locations with no news
+_SAMPLE_SIZE = 8
+
+# Cap on simultaneous outbound requests to the news providers per game start
+_MAX_CONCURRENT_FETCHES = 5
+
+_BASE62_ALPHABET = string.digits + string.ascii_letters
+
+# Random bits per game id; 96 bits keeps ids unguessable and collision-free across workers
+_GAME_ID_BITS = 96
+
+
+def set_redis_client(client: Redis | None) -> None:
+    global _redis
+    _redis = client
+
+
+def _session_key(game_id: str) -> str:
+    return f"game:{game_id}"
+
+
+def _encode_session(session: GameSession) -> bytes:
+    # orjson serializes dataclasses and datetimes natively
+    return orjson.dumps(session)
+
+
+def _decode_session(raw: bytes) -> GameSession:
+    data = orjson.loads(raw)
+    data["rounds"] = [GameRound(**game_round) for game_round in data["rounds"]]
+    data["created_at"] = datetime.fromisoformat(data["created_at"])
+    return GameSession(**data)
+
+
+async def _load_session(game_id: str) -> GameSession | None:
+    if _redis is None:
+        return _game_sessions.get(game_id)
+
+    raw = await _redis.get(_session_key(game_id))
+    return _decode_session(raw) if raw is not None else None
+
+
+async def _store_new_session(session: GameSession) -> None:
+    if _redis is None:
+        _game_sessions[session.game_id] = session
+        heapq.heappush(
+            _expiry_heap,
+            (session.created_at.timestamp() + SESSION_TTL_SECONDS, session.game_id),
+        )
+        # Clean up old sessions
+        _cleanup_old_sessions()
+        _evict_excess_sessions()
+        return
+
+    # Redis expires the session, so no cleanup pass is needed
+    await _redis.setex(
+        _session_key(session.game_id), SESSION_TTL_SECONDS, _encode_session(session)
+    )
+
 
 async def start_game() -> GameStartResponse:
     """
@@ -39,27 +124,38 @@ async def start_game() -> GameStartResponse:
     if len(locations) < 5:
         raise Exception(f"Need at least 5 locations, but only {len(locations)} available")
 
-    # Select 5 random unique cities
-    selected_locations = random.sample(locations, 5)
+    # Over-sample cities so a few empty news fetches don't starve the game,
+    # favouring cities whose news fetches have usually succeeded
+    weights = await get_fetch_success_rates([loc.location_id for loc in locations])
+    sampled_locations = _weighted_sample(locations, weights, min(_SAMPLE_SIZE, len(locations)))
+
+    # Fetch headlines for all sampled locations concurrently
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENT_FETCHES)
+
+    async def fetch(location):
+        async with semaphore:
+            return await get_headlines(location.location_id, location.city, location.country)
+
+    results = await asyncio.gather(
+        *(fetch(location) for location in sampled_locations),
+        return_exceptions=True,
+    )
 
-    # Fetch headlines for each location
     rounds = []
-    for i, location in enumerate(selected_locations):
-        headlines = await get_headlines(
-            location.location_id,
-            location.city,
-            location.country
-        )
+    for location, headlines in zip(sampled_locations, results):
+        if isinstance(headlines, BaseException):
+            logger.warning(f"Failed to fetch headlines for {location.city}: {headlines}")
+            continue
 
-        if not headlines or len(headlines) == 0:
+        if not headlines:
             logger.warning(f"No headlines available for {location.city}, skipping")
             continue
 
         # Randomly select a headline from available headlines
-        headline = random.choice(headlines)
+        headline = _rng.choice(headlines)
 
         rounds.append(GameRound(
-            round_number=i + 1,
+            round_number=len(rounds) + 1,
             headline_title=headline.title,
             location_id=location.location_id
         ))
@@ -68,36 +164,11 @@ async def start_game() -> GameStartResponse:
         if len(rounds) >= 5:
             break
 
-    if len(rounds) < 5:
-        # Try to fetch more rounds if we didn't get enough
-        remaining_locations = [loc for loc in locations if loc.location_id not in
-                              [round.location_id for round in rounds]]
-        random.shuffle(remaining_locations)
-
-        for location in remaining_locations:
-            if len(rounds) >= 5:
-                break
-
-            headlines = await get_headlines(
-                location.location_id,
-                location.city,
-                location.country
-            )
-
-            if headlines and len(headlines) > 0:
-                # Randomly select a headline from available headlines
-                headline = random.choice(headlines)
-                rounds.append(GameRound(
-                    round_number=len(rounds) + 1,
-                    headline_title=headline.title,
-                    location_id=location.location_id
-                ))
-
     if len(rounds) < 5:
         raise Exception(f"Unable to fetch enough headlines for game. Only got {len(rounds)} rounds.")
 
     # Create game session
-    game_id = str(uuid.uuid4())
+    game_id = _new_game_id()
     session = GameSession(
         game_id=game_id,
         rounds=rounds[:5],  # Ensure exactly 5 rounds
@@ -106,10 +177,7 @@ async def start_game() -> GameStartResponse:
         created_at=datetime.now(timezone.utc)
     )
 
-    _game_sessions[game_id] = session
-
-    # Clean up old sessions
-    _cleanup_old_sessions()
+    await _store_new_session(session)
 
     logger.info(f"Started new game {game_id} with {len(session.rounds)} rounds")
 
@@ -121,10 +189,41 @@ async def start_game() -> GameStartResponse:
     )
 
 
+def _new_game_id() -> str:
+    """
+    Random base62 game id, at most 17 characters versus 36 for a UUID string.
+
+    Random rather than sequential so ids can't be guessed from one another and
+    workers never hand out the same id.
+    """
+    value = secrets.randbits(_GAME_ID_BITS)
+    digits = []
+    while True:
+        value, remainder = divmod(value, 62)
+        digits.append(_BASE62_ALPHABET[remainder])
+        if not value:
+            break
+    return "".join(reversed(digits))
+
+
+def _weighted_sample(population: Sequence, weights: list[float], k: int) -> list:
+    """
+    Pick k distinct items, each item's chance proportional to its weight.
+
+    Uses Efraimidis-Spirakis keys (u ** (1 / w)), so a single pass replaces
+    repeated random.choices calls with de-duplication.
+    """
+    keyed = ((_rng.random() ** (1.0 / weight), item) for item, weight in zip(population, weights))
+    return [item for _, item in heapq.nlargest(k, keyed, key=lambda pair: pair[0])]
+
+
 async def submit_guess(game_id: str, guess: GuessRequest) -> GuessResponse:
     """
     Process a player's guess for the current round.
 
+    With Redis, the session is updated inside a WATCH/MULTI transaction so
+    concurrent guesses for the same game can't score a round twice.
+
     Args:
         game_id: Game session identifier
         guess: Player's guess coordinates
@@ -135,7 +234,76 @@ async def submit_guess(game_id: str, guess: GuessRequest) -> GuessResponse:
     Raises:
         ValueError: If game not found, already completed, or round already completed
     """
-    session = _game_sessions.get(game_id)
+    return await _update_session(game_id, lambda session: _apply_guess(game_id, session, guess))
+
+
+async def submit_guesses(game_id: str, guesses: Sequence[GuessRequest]) -> list[GuessResponse]:
+    """
+    Process guesses for several consecutive rounds in one call.
+
+    Guesses are applied in order starting from the current round, in a single
+    session update, so the batch is scored exactly like the same guesses sent
+    one at a time.
+
+    Args:
+        game_id: Game session identifier
+        guesses: Player's guess coordinates, one per round
+
+    Returns:
+        One GuessResponse per guess, in round order
+
+    Raises:
+        ValueError: If game not found or completed, or there are more guesses
+            than rounds left
+    """
+    if not guesses:
+        raise ValueError("At least one guess is required")
+
+    def apply(session: GameSession | None) -> list[GuessResponse]:
+        if session and not session.completed:
+            remaining = len(session.rounds) - session.current_round_index
+            if len(guesses) > remaining:
+                # Checked up front so a rejected batch leaves the session untouched
+                raise ValueError(f"Got {len(guesses)} guesses but only {remaining} rounds left")
+        return [_apply_guess(game_id, session, guess) for guess in guesses]
+
+    return await _update_session(game_id, apply)
+
+
+async def _update_session(game_id: str, apply: Callable[[GameSession | None], T]) -> T:
+    """
+    Run apply against the stored session and persist whatever it changed.
+
+    In memory, the session is mutated in place. With Redis, it is updated inside
+    a WATCH/MULTI transaction, retried if another request changed it first.
+    """
+    if _redis is None:
+        return apply(_game_sessions.get(game_id))
+
+    key = _session_key(game_id)
+    for _ in range(_MAX_GUESS_ATTEMPTS):
+        async with _redis.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                raw = await pipe.get(key)
+                session = _decode_session(raw) if raw is not None else None
+                result = apply(session)
+
+                pipe.multi()
+                pipe.set(key, _encode_session(session), keepttl=True)
+                await pipe.execute()
+                return result
+            except WatchError:
+                # Another guess updated the session first; retry against fresh state
+                continue
+
+    raise ValueError("Game is being updated by another request, please retry")
+
+
+def _apply_guess(
+    game_id: str, session: GameSession | None, guess: GuessRequest
+) -> GuessResponse:
+    """Score a guess against the session's current round and advance the session."""
     if not session:
         raise ValueError(f"Game {game_id} not found")
 
@@ -197,7 +365,7 @@ async def submit_guess(game_id: str, guess: GuessRequest) -> GuessResponse:
     )
 
 
-def get_next_round(game_id: str) -> Optional[dict]:
+async def get_next_round(game_id: str) -> Optional[dict]:
     """
     Get the next round's headline after completing previous round.
 
@@ -207,7 +375,7 @@ def get_next_round(game_id: str) -> Optional[dict]:
     Returns:
         Dictionary with round_number and headline, or None if game complete
     """
-    session = _game_sessions.get(game_id)
+    session = await _load_session(game_id)
     if not session or session.completed:
         return None
 
@@ -218,7 +386,7 @@ def get_next_round(game_id: str) -> Optional[dict]:
     }
 
 
-def get_game_results(game_id: str) -> GameResultsResponse:
+async def get_game_results(game_id: str) -> GameResultsResponse:
     """
     Get final game results and statistics.
 
@@ -231,7 +399,7 @@ def get_game_results(game_id: str) -> GameResultsResponse:
     Raises:
         ValueError: If game not found or has no completed rounds
     """
-    session = _game_sessions.get(game_id)
+    session = await _load_session(game_id)
     if not session:
         raise ValueError(f"Game {game_id} not found")
 
@@ -240,14 +408,12 @@ def get_game_results(game_id: str) -> GameResultsResponse:
     if not completed_rounds:
         raise ValueError("No completed rounds in this game")
 
-    # Calculate average distance
-    total_distance = sum(r.distance_km for r in completed_rounds)
-    avg_distance = total_distance / len(completed_rounds)
-
-    # Build rounds summary
+    # Build rounds summary and total distance in a single pass
+    total_distance = 0.0
     rounds_summary = []
     for round in completed_rounds:
         location = get_location_by_id(round.location_id)
+        total_distance += round.distance_km
         rounds_summary.append({
             "round_number": round.round_number,
             "city": location.city if location else "Unknown",
@@ -257,6 +423,8 @@ def get_game_results(game_id: str) -> GameResultsResponse:
             "score": round.score
         })
 
+    avg_distance = total_distance / len(completed_rounds)
+
     logger.info(f"Game {game_id} results: total_score={session.total_score}, avg_distance={avg_distance:.1f}km")
 
     return GameResultsResponse(
@@ -269,16 +437,31 @@ def get_game_results(game_id: str) -> GameResultsResponse:
 
 
 def _cleanup_old_sessions():
-    """Remove game sessions older than 1 hour to prevent memory leak."""
-    cutoff = datetime.now(timezone.utc) - timedelta(hours=1)
-    to_delete = [
-        game_id for game_id, session in _game_sessions.items()
-        if session.created_at < cutoff
-    ]
-
-    for game_id in to_delete:
-        del _game_sessions[game_id]
-        logger.debug(f"Cleaned up old game session {game_id}")
-
-    if to_delete:
-        logger.info(f"Cleaned up {len(to_delete)} old game sessions")
+    """Remove in-memory game sessions older than 1 hour to prevent memory leak."""
+    now = time.time()
+    cleaned = 0
+
+    # Only expired entries are popped; live sessions are never visited
+    while _expiry_heap and _expiry_heap[0][0] <= now:
+        _, game_id = heapq.heappop(_expiry_heap)
+        if _game_sessions.pop(game_id, None) is not None:
+            cleaned += 1
+            logger.debug(f"Cleaned up old game session {game_id}")
+
+    if cleaned:
+        logger.info(f"Cleaned up {cleaned} old game sessions")
+
+
+def _evict_excess_sessions():
+    """Drop the oldest in-memory sessions once the store exceeds its fixed capacity."""
+    evicted = 0
+    while len(_game_sessions) > settings.max_game_sessions and _expiry_heap:
+        _, game_id = heapq.heappop(_expiry_heap)
+        if _game_sessions.pop(game_id, None) is not None:
+            evicted += 1
+
+    if evicted:
+        logger.warning(
+            f"Evicted {evicted} game sessions; in-memory store is capped at "
+            f"{settings.max_game_sessions}"
+        )
@@ -1,25 +1,71 @@
-import json
 import logging
+import math
+import threading
 from pathlib import Path
 
+import numpy as np
+import orjson
+from pydantic import TypeAdapter
+
 from global_news_map.models.schemas import Location
+from global_news_map.utils.distance import haversine_distance_radians
+from global_news_map.utils.etag import compute_etag
 
 logger = logging.getLogger(__name__)
-_locations: list[Location] = []
+_locations_adapter = TypeAdapter(tuple[Location, ...])
+# (real path, mtime_ns) of the file currently loaded, to skip redundant reloads
+_loaded_source: tuple[Path, int] | None = None
+# Serializes loads so concurrent callers don't parse the same file twice
+_load_lock = threading.Lock()
+# Immutable once loaded; reloading replaces the whole tuple
+_locations: tuple[Location, ...] = ()
+_locations_by_id: dict[str, Location] = {}
+_locations_body: bytes = b"[]"
+_locations_etag: str = ""
+# (N, 2) float64 array of [lat, lng] in degrees, row-aligned with _locations
+_coordinates: np.ndarray = np.empty((0, 2), dtype=np.float64)
+# Structure-of-arrays view in radians with trig precomputed for distance queries (float32)
+_lat_rad: np.ndarray = np.empty(0, dtype=np.float32)
+_lng_rad: np.ndarray = np.empty(0, dtype=np.float32)
+_cos_lat: np.ndarray = np.empty(0, dtype=np.float32)
 
 
-def load_locations(file_path: str) -> list[Location]:
-    global _locations
+def load_locations(file_path: str) -> tuple[Location, ...]:
     path = Path(file_path)
     if not path.is_absolute():
         path = Path(__file__).resolve().parents[3] / file_path
+    # Canonical path, so symlinked or differently spelled paths share one load
+    path = path.resolve()
+
+    with _load_lock:
+        return _load_locations_locked(path)
 
-    logger.info(f"Loading locations from: {path}")
 
+def _load_locations_locked(path: Path) -> tuple[Location, ...]:
+    global _locations, _locations_by_id, _locations_body, _locations_etag, _coordinates
+    global _lat_rad, _lng_rad, _cos_lat, _loaded_source
     try:
-        with open(path) as f:
-            data = json.load(f)
-        _locations = [Location(**loc) for loc in data]
+        source = (path, path.stat().st_mtime_ns)
+        if source == _loaded_source:
+            logger.debug(f"Locations already loaded from: {path}")
+            return _locations
+
+        logger.info(f"Loading locations from: {path}")
+        with open(path, "rb") as f:
+            data = orjson.loads(f.read())
+        _locations = _locations_adapter.validate_python(data)
+        _locations_by_id = {loc.location_id: loc for loc in _locations}
+        _coordinates = np.array(
+            [(loc.lat, loc.lng) for loc in _locations], dtype=np.float64
+        ).reshape(-1, 2)
+        lat_rad = np.deg2rad(_coordinates[:, 0])
+        # float32 is accurate to meters at Earth scale and halves the scan footprint
+        _lat_rad = lat_rad.astype(np.float32)
+        _lng_rad = np.deg2rad(_coordinates[:, 1]).astype(np.float32)
+        _cos_lat = np.cos(lat_rad).astype(np.float32)
+        _locations_body = orjson.dumps([loc.model_dump() for loc in _locations])
+        _locations_etag = compute_etag(_locations_body)
+        _loaded_source = source
         logger.info(f"Successfully loaded {len(_locations)} locations")
         for loc in _locations:
             logger.debug(f"  - {loc.city}, {loc.country}")
@@ -27,17 +73,69 @@ def load_locations(file_path: str) -> list[Location]:
     except FileNotFoundError:
         logger.error(f"Locations file not found at: {path}")
         raise
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Invalid JSON in locations file: {e}")
         raise
 
 
-def get_all_locations() -> list[Location]:
+def get_all_locations() -> tuple[Location, ...]:
     return _locations
 
 
+def get_location_coordinates() -> np.ndarray:
+    """
+    Coordinates of all locations as an (N, 2) array of [lat, lng] in degrees.
+
+    Rows line up with get_all_locations(), so the array can be passed straight
+    to haversine_distance_batch for distance-to-every-location queries.
+    """
+    return _coordinates
+
+
+def get_distances_from(lat: float, lng: float) -> np.ndarray:
+    """
+    Distance in kilometers from a point to every location, in one vectorized call.
+
+    The result is row-aligned with get_all_locations().
+    """
+    return haversine_distance_radians(
+        np.float32(math.radians(lat)), np.float32(math.radians(lng)), _lat_rad, _lng_rad, _cos_lat
+    )
+
+
+def nearest_locations(lat: float, lng: float, k: int = 1) -> list[tuple[Location, float]]:
+    """
+    The k locations closest to a point, nearest first.
+
+    Args:
+        lat: Latitude of the query point in degrees
+        lng: Longitude of the query point in degrees
+        k: Number of locations to return
+
+    Returns:
+        (location, distance in km) pairs sorted by distance
+    """
+    distances = get_distances_from(lat, lng)
+    k = min(k, len(distances))
+    if k <= 0:
+        return []
+
+    # Partial partition is O(N); only the k survivors get sorted
+    nearest = np.argpartition(distances, k - 1)[:k]
+    nearest = nearest[np.argsort(distances[nearest])]
+    return [(_locations[i], float(distances[i])) for i in nearest.tolist()]
+
+
+def get_locations_body() -> bytes:
+    """All locations pre-serialized as a JSON array, built once at load time."""
+    return _locations_body
+
+
+def get_locations_etag() -> str:
+    """ETag for the loaded locations; it only changes when the data file is reloaded."""
+    return _locations_etag
+
+
 def get_location_by_id(location_id: str) -> Location | None:
-    for loc in _locations:
-        if loc.location_id == location_id:
-            return loc
-    return None
+    return _locations_by_id.get(location_id)
+
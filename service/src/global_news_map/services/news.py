@@ -1,31 +1,139 @@
+import asyncio
+import logging
 import time
+from collections.abc import Sequence
 from datetime import datetime, timezone
 
-import feedparser
 import httpx
+from lxml import etree
+from pydantic import TypeAdapter
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
 
 from global_news_map.config import settings
-from global_news_map.models.schemas import Headline
+from global_news_map.models.schemas import Headline, Location
 
+logger = logging.getLogger(__name__)
+
+# Settings are fixed for the life of the process, so convert the TTL once
+_CACHE_TTL_SECONDS = settings.cache_ttl_minutes * 60
+
+# L1: per-process cache, checked first to avoid a Redis round-trip on hot keys
 _cache: dict[str, tuple[list[Headline], float]] = {}
 
+# L2: optional Redis cache shared by all workers, configured via settings.redis_url
+_redis: Redis | None = None
+_headlines_adapter = TypeAdapter(list[Headline])
+
+# Upstream fetch outcomes per location_id, used to favour locations that usually have news
+_attempt_count: dict[str, int] = {}
+_success_count: dict[str, int] = {}
+_ATTEMPTS_KEY = "news:stats:attempts"
+_SUCCESSES_KEY = "news:stats:successes"
+
+# In-flight upstream fetches by location_id, so concurrent misses share one request
+_inflight: dict[str, asyncio.Task] = {}
+
+# Upstream requests allowed at once while warming the cache for all locations
+_PREWARM_CONCURRENCY = 10
+
+# How often the background task looks for cached headlines that are about to expire
+_REFRESH_INTERVAL_SECONDS = 300
+# Entries expiring within this window are re-fetched, so each one is refreshed by the
+# pass before the one it would expire in
+_REFRESH_WITHIN_SECONDS = 2 * _REFRESH_INTERVAL_SECONDS
+
+# With Redis, only the worker holding this key runs a warm/refresh pass
+_PREWARM_LOCK_KEY = "news:prewarm:lock"
+
+# Google News RSS is plain, well-formed XML; never resolve entities or fetch DTDs
+_rss_parser = etree.XMLParser(resolve_entities=False, no_network=True)
+
+# Shared HTTP client with a keep-alive connection pool, set up in the app lifespan
+_http_client: httpx.AsyncClient | None = None
+
+
+def set_redis_client(client: Redis | None) -> None:
+    global _redis
+    _redis = client
 
-def _cache_ttl_seconds() -> int:
-    return settings.cache_ttl_minutes * 60
 
+def set_http_client(client: httpx.AsyncClient | None) -> None:
+    global _http_client
+    _http_client = client
 
-def _get_cached(location_id: str) -> list[Headline] | None:
-    if location_id in _cache:
-        headlines, cached_time = _cache[location_id]
-        if time.time() - cached_time < _cache_ttl_seconds():
+
+async def _http_get(url: str, **kwargs) -> httpx.Response:
+    if _http_client is not None:
+        return await _http_client.get(url, **kwargs)
+    # No shared client outside the app lifespan (e.g. scripts, tests)
+    async with httpx.AsyncClient(follow_redirects=True) as client:
+        return await client.get(url, **kwargs)
+
+
+def _redis_key(location_id: str) -> str:
+    return f"news:{location_id}"
+
+
+async def _get_cached(location_id: str) -> list[Headline] | None:
+    entry = _cache.get(location_id)
+    if entry is not None:
+        headlines, cached_time = entry
+        if time.time() - cached_time < _CACHE_TTL_SECONDS:
             return headlines
-        del _cache[location_id]
-    return None
+        _cache.pop(location_id, None)
+
+    if _redis is None:
+        return None
+
+    try:
+        raw = await _redis.get(_redis_key(location_id))
+    except RedisError as e:
+        logger.warning(f"Redis cache read failed for {location_id}: {e}")
+        return None
+    if raw is None:
+        return None
+
+    try:
+        headlines = _headlines_adapter.validate_json(raw)
+    except ValueError as e:  # includes pydantic's ValidationError
+        # Corrupt or old-schema entry; drop it so the next fetch replaces it
+        logger.warning(f"Discarding unreadable Redis cache entry for {location_id}: {e}")
+        try:
+            await _redis.delete(_redis_key(location_id))
+        except RedisError as delete_error:
+            logger.warning(f"Redis cache delete failed for {location_id}: {delete_error}")
+        return None
+    # Keep the original fetch time so L1 expires together with the Redis entry
+    cached_time = min(h.cached_at for h in headlines).timestamp() if headlines else time.time()
+    _cache[location_id] = (headlines, cached_time)
+    return headlines
+
+
+def get_cache_max_age(headlines: Sequence[Headline]) -> int:
+    """Seconds until cached headlines expire, for use as an HTTP max-age."""
+    if not headlines:
+        return 0
+    # Same fetch time the in-process cache expires by
+    fetched_at = min(h.cached_at for h in headlines).timestamp()
+    return max(int(fetched_at + _CACHE_TTL_SECONDS - time.time()), 0)
 
 
-def _set_cache(location_id: str, headlines: list[Headline]) -> None:
+async def _set_cache(location_id: str, headlines: list[Headline]) -> None:
     _cache[location_id] = (headlines, time.time())
 
+    if _redis is None:
+        return
+
+    try:
+        await _redis.setex(
+            _redis_key(location_id),
+            _CACHE_TTL_SECONDS,
+            _headlines_adapter.dump_json(headlines),
+        )
+    except RedisError as e:
+        logger.warning(f"Redis cache write failed for {location_id}: {e}")
+
 
 async def fetch_from_newsapi(city: str, country: str) -> list[Headline] | None:
     if not settings.news_api_key:
@@ -37,58 +145,248 @@ async def fetch_from_newsapi(city: str, country: str) -> list[Headline] | None:
         "language": "en",
         "category": "politics,business,breaking"
     }
-    async with httpx.AsyncClient(follow_redirects=True) as client:
-        resp = await client.get(url, params=params, timeout=10)
-        if resp.status_code != 200:
-            return None
-        data = resp.json()
-        results = data.get("results", [])
-        if not results:
-            return None
-        headlines = []
-        for article in results[:3]:
-            headlines.append(Headline(
-                title=article.get("title", "No title"),
-                source=article.get("source_id", "Unknown"),
-                published_at=article.get("pubDate", ""),
-                url=article.get("link", ""),
-                cached_at=datetime.now(timezone.utc),
-            ))
-        return headlines if headlines else None
+    resp = await _http_get(url, params=params, timeout=10)
+    if resp.status_code != 200:
+        return None
+    data = resp.json()
+    results = data.get("results", [])
+    if not results:
+        return None
+    headlines = []
+    for article in results[:3]:
+        headlines.append(Headline(
+            title=article.get("title", "No title"),
+            source=article.get("source_id", "Unknown"),
+            published_at=article.get("pubDate", ""),
+            url=article.get("link", ""),
+            cached_at=datetime.now(timezone.utc),
+        ))
+    return headlines if headlines else None
 
 
 async def fetch_from_google_rss(city: str, country: str) -> list[Headline] | None:
     query = f"{city} {country}"
     url = f"https://news.google.com/rss/search?q={query}&hl=en&gl=US&ceid=US:en"
-    async with httpx.AsyncClient(follow_redirects=True) as client:
-        resp = await client.get(url, timeout=10)
-        if resp.status_code != 200:
-            return None
-    feed = feedparser.parse(resp.text)
-    if not feed.entries:
+    resp = await _http_get(url, timeout=10)
+    if resp.status_code != 200:
+        return None
+    try:
+        root = etree.fromstring(resp.content, parser=_rss_parser)
+    except etree.XMLSyntaxError as e:
+        logger.warning(f"Invalid RSS feed for {city}: {e}")
+        return None
+    items = root.findall("./channel/item")
+    if not items:
         return None
     headlines = []
-    for entry in feed.entries[:3]:
-        published = entry.get("published", "")
-        headlines.append(Headline(
-            title=entry.get("title", "No title"),
-            source=entry.get("source", {}).get("title", "Google News"),
-            published_at=published,
-            url=entry.get("link", ""),
-            cached_at=datetime.now(timezone.utc),
+    cached_at = datetime.now(timezone.utc)
+    for item in items[:3]:
+        # findtext with a default always yields strings, so skip re-validating each field
+        headlines.append(Headline.model_construct(
+            title=item.findtext("title") or "No title",
+            source=item.findtext("source") or "Google News",
+            published_at=item.findtext("pubDate", ""),
+            url=item.findtext("link", ""),
+            cached_at=cached_at,
         ))
-    return headlines if headlines else None
+    return headlines
+
+
+async def _fetch_first_available(city: str, country: str) -> list[Headline] | None:
+    """
+    Fetch headlines from the configured upstream sources.
+
+    By default only Google News RSS is queried. With settings.race_news_sources,
+    NewsData.io and Google News RSS are queried concurrently and the first
+    non-empty result wins, cancelling the slower request. NewsData.io wins if
+    both finish together. Cancelling it does not refund the request, so racing
+    spends NewsData.io quota on every cache miss.
+    """
+    if not settings.race_news_sources:
+        # Skip NewsData.io API (rate limited) and use Google News RSS directly
+        return await fetch_from_google_rss(city, country)
+
+    newsapi_task = asyncio.create_task(fetch_from_newsapi(city, country))
+    rss_task = asyncio.create_task(fetch_from_google_rss(city, country))
+    pending = {newsapi_task, rss_task}
+
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in (newsapi_task, rss_task):
+                if task not in done:
+                    continue
+                try:
+                    headlines = task.result()
+                except Exception as e:
+                    logger.warning(f"News fetch failed for {city}: {e!r}")
+                    continue
+                if headlines:
+                    return headlines
+        return None
+    finally:
+        for task in pending:
+            task.cancel()
 
 
 async def get_headlines(location_id: str, city: str, country: str) -> list[Headline] | None:
-    cached = _get_cached(location_id)
+    cached = await _get_cached(location_id)
     if cached:
         return cached
 
-    # Skip NewsData.io API (rate limited) and use Google News RSS directly
-    headlines = await fetch_from_google_rss(city, country)
+    return await _fetch_and_cache(location_id, city, country)
 
-    if headlines:
-        _set_cache(location_id, headlines)
 
+async def _fetch_and_cache(location_id: str, city: str, country: str) -> list[Headline] | None:
+    task = _inflight.get(location_id)
+    if task is None:
+        # The fetch runs in its own task so no single caller owns it
+        task = asyncio.create_task(_fetch_and_store(location_id, city, country))
+        _inflight[location_id] = task
+        task.add_done_callback(lambda done: _finish_inflight(location_id, done))
+
+    # Shield so a cancelled caller doesn't cancel the fetch other requests are sharing
+    return await asyncio.shield(task)
+
+
+def _finish_inflight(location_id: str, task: asyncio.Task) -> None:
+    if _inflight.get(location_id) is task:
+        del _inflight[location_id]
+    # Mark the exception as retrieved in case every caller was cancelled
+    if not task.cancelled():
+        task.exception()
+
+
+async def _fetch_and_store(location_id: str, city: str, country: str) -> list[Headline] | None:
+    headlines = await _fetch_first_available(city, country)
+    if headlines:
+        await _set_cache(location_id, headlines)
+    await _record_fetch_outcome(location_id, bool(headlines))
     return headlines
+
+
+async def _record_fetch_outcome(location_id: str, success: bool) -> None:
+    _attempt_count[location_id] = _attempt_count.get(location_id, 0) + 1
+    if success:
+        _success_count[location_id] = _success_count.get(location_id, 0) + 1
+
+    if _redis is None:
+        return
+
+    try:
+        async with _redis.pipeline(transaction=False) as pipe:
+            pipe.hincrby(_ATTEMPTS_KEY, location_id, 1)
+            if success:
+                pipe.hincrby(_SUCCESSES_KEY, location_id, 1)
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Failed to record fetch stats for {location_id}: {e}")
+
+
+async def get_fetch_success_rates(location_ids: list[str]) -> list[float]:
+    """
+    Estimate how likely each location is to return headlines.
+
+    Uses (successes + 1) / (attempts + 2), so locations that have never been
+    fetched start at 0.5. Counts are shared through Redis when it is configured.
+
+    Args:
+        location_ids: Locations to look up
+
+    Returns:
+        Success rates in the same order as location_ids
+    """
+    attempts = [_attempt_count.get(location_id, 0) for location_id in location_ids]
+    successes = [_success_count.get(location_id, 0) for location_id in location_ids]
+
+    if _redis is not None and location_ids:
+        try:
+            async with _redis.pipeline(transaction=False) as pipe:
+                pipe.hmget(_ATTEMPTS_KEY, location_ids)
+                pipe.hmget(_SUCCESSES_KEY, location_ids)
+                shared_attempts, shared_successes = await pipe.execute()
+            attempts = [int(count or 0) for count in shared_attempts]
+            successes = [int(count or 0) for count in shared_successes]
+        except RedisError as e:
+            logger.warning(f"Failed to read fetch stats, using local counts: {e}")
+
+    return [(s + 1) / (a + 2) for s, a in zip(successes, attempts)]
+
+
+async def _seconds_until_expiry(location_id: str) -> float:
+    """Time left on the cached entry for a location, 0 if nothing is cached."""
+    if _redis is not None:
+        try:
+            # -2 when the key doesn't exist
+            return max(await _redis.ttl(_redis_key(location_id)), 0)
+        except RedisError as e:
+            logger.warning(f"Redis TTL lookup failed for {location_id}: {e}")
+
+    entry = _cache.get(location_id)
+    if entry is None:
+        return 0.0
+    return max(entry[1] + _CACHE_TTL_SECONDS - time.time(), 0.0)
+
+
+async def prewarm_cache(locations: Sequence[Location], refresh_within: float = 0) -> int:
+    """
+    Fetch headlines for every location with bounded concurrency.
+
+    Locations that are already cached are only looked up, not re-fetched.
+
+    Args:
+        locations: Locations to warm
+        refresh_within: Also re-fetch entries that expire within this many seconds
+
+    Returns:
+        Number of locations that now have cached headlines
+    """
+    semaphore = asyncio.Semaphore(_PREWARM_CONCURRENCY)
+
+    async def warm(location: Location) -> list[Headline] | None:
+        async with semaphore:
+            args = (location.location_id, location.city, location.country)
+            expires_in = await _seconds_until_expiry(location.location_id) if refresh_within else 0
+            if refresh_within and expires_in < refresh_within:
+                return await _fetch_and_cache(*args)
+            return await get_headlines(*args)
+
+    results = await asyncio.gather(*(warm(loc) for loc in locations), return_exceptions=True)
+    warmed = sum(1 for result in results if result and not isinstance(result, BaseException))
+    logger.info(f"Warmed news cache for {warmed}/{len(locations)} locations")
+    return warmed
+
+
+async def _claim_cache_pass() -> bool:
+    """
+    Whether this worker should run the next warm/refresh pass.
+
+    Every Gunicorn worker runs keep_cache_warm, but the Redis cache is shared, so
+    one pass per interval is enough. The first worker to set the lock key wins
+    until it expires. Without Redis each worker has its own cache and always runs.
+    """
+    if _redis is None:
+        return True
+    try:
+        return bool(
+            await _redis.set(_PREWARM_LOCK_KEY, b"1", nx=True, ex=_REFRESH_INTERVAL_SECONDS)
+        )
+    except RedisError as e:
+        logger.warning(f"Failed to claim the news cache refresh, running it locally: {e}")
+        return True
+
+
+async def keep_cache_warm(locations: Sequence[Location]) -> None:
+    """
+    Warm the cache for all locations, then periodically re-fetch entries that
+    are about to expire so requests are served from a warm cache. Runs until cancelled.
+    """
+    refresh_within = 0.0
+    while True:
+        try:
+            if await _claim_cache_pass():
+                await prewarm_cache(locations, refresh_within=refresh_within)
+        except Exception:
+            logger.exception("News cache refresh failed")
+        refresh_within = _REFRESH_WITHIN_SECONDS
+        await asyncio.sleep(_REFRESH_INTERVAL_SECONDS)
@@ -1,8 +1,44 @@
 """Distance calculation utilities for game scoring."""
 
 import math
+from math import acos, asin, atan2, cos, sin, sqrt
 
+import numpy as np
 
+try:
+    from numba import njit
+except ImportError:  # numba is an optional extra; fall back to plain Python
+    njit = None
+
+EARTH_RADIUS_KM = 6371.0
+
+# Guesses this far away or more score 0
+MAX_SCORE_DISTANCE_KM = 20000.0
+
+# math.pi / 180, multiplied inline instead of calling math.radians
+_DEG2RAD = 0.017453292519943295
+
+# Law-of-cosines arguments this close to 1 are the same point: acos would turn the
+# last-bit rounding error into ~1e-4 km, enough to cost a perfect guess a point
+_COS_SAME_POINT = 1.0 - 4 * 2.220446049250313e-16
+
+
+def _jit(func=None, *, fastmath=True):
+    """
+    Compile a function to native code with numba when it is installed.
+
+    Compiled functions are built with nogil. That has no effect today, since
+    all routes are async and score on the event loop. It only matters if
+    scoring is later moved into worker threads, which could then overlap.
+    """
+    if func is None:
+        return lambda f: _jit(f, fastmath=fastmath)
+    if njit is None:
+        return func
+    return njit(cache=True, fastmath=fastmath, nogil=True)(func)
+
+
+@_jit
 def haversine_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
     """
     Calculate distance between two points on Earth using Haversine formula.
@@ -16,24 +52,176 @@ def haversine_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> fl
     Returns:
         Distance in kilometers
     """
-    R = 6371  # Earth's radius in kilometers
+    R = EARTH_RADIUS_KM
 
     # Convert degrees to radians
-    lat1_rad = math.radians(lat1)
-    lat2_rad = math.radians(lat2)
-    delta_lat = math.radians(lat2 - lat1)
-    delta_lng = math.radians(lng2 - lng1)
+    lat1_rad = lat1 * _DEG2RAD
+    lat2_rad = lat2 * _DEG2RAD
+    delta_lat = (lat2 - lat1) * _DEG2RAD
+    delta_lng = (lng2 - lng1) * _DEG2RAD
 
     # Haversine formula
-    a = (math.sin(delta_lat / 2) ** 2 +
-         math.cos(lat1_rad) * math.cos(lat2_rad) *
-         math.sin(delta_lng / 2) ** 2)
+    a = (sin(delta_lat / 2) ** 2 +
+         cos(lat1_rad) * cos(lat2_rad) *
+         sin(delta_lng / 2) ** 2)
 
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    c = 2 * atan2(sqrt(a), sqrt(1 - a))
 
     return R * c
 
 
+@_jit
+def cosine_distance_precomputed(
+    lat1: float, lng1: float, sin_lat2: float, cos_lat2: float, lng2: float
+) -> float:
+    """
+    Great-circle distance via the spherical law of cosines, with the second
+    point's latitude sine and cosine supplied by the caller.
+
+    Cheaper than Haversine (no sqrt, atan2 or half-angle sines) and within
+    meters of it for anything but near-antipodal points, which is far below
+    the resolution of the score.
+
+    Args:
+        lat1: Latitude of first point in degrees
+        lng1: Longitude of first point in degrees
+        sin_lat2: sin of second point's latitude (radians)
+        cos_lat2: cos of second point's latitude (radians)
+        lng2: Longitude of second point in degrees
+
+    Returns:
+        Distance in kilometers
+    """
+    lat1_rad = lat1 * _DEG2RAD
+    x = sin(lat1_rad) * sin_lat2 + cos(lat1_rad) * cos_lat2 * cos((lng2 - lng1) * _DEG2RAD)
+    if x >= _COS_SAME_POINT:
+        return 0.0
+    # Rounding can push x just below -1 for antipodal points
+    return EARTH_RADIUS_KM * acos(max(-1.0, x))
+
+
+@_jit
+def cosine_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """
+    Calculate distance between two points using the spherical law of cosines.
+
+    Args:
+        lat1: Latitude of first point in degrees
+        lng1: Longitude of first point in degrees
+        lat2: Latitude of second point in degrees
+        lng2: Longitude of second point in degrees
+
+    Returns:
+        Distance in kilometers
+    """
+    lat2_rad = lat2 * _DEG2RAD
+    return cosine_distance_precomputed(lat1, lng1, sin(lat2_rad), cos(lat2_rad), lng2)
+
+
+def haversine_distance_batch(
+    lat1: np.ndarray, lng1: np.ndarray, lat2: np.ndarray, lng2: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized Haversine distance for many point pairs at once.
+
+    Inputs follow NumPy broadcasting rules, so a single point can be
+    compared against an array of points (e.g. every location) in one call;
+    that case goes through haversine_distance_radians. Prefer
+    haversine_distance for a single pair; it avoids array overhead.
+
+    Args:
+        lat1: Latitudes of first points in degrees
+        lng1: Longitudes of first points in degrees
+        lat2: Latitudes of second points in degrees
+        lng2: Longitudes of second points in degrees
+
+    Returns:
+        Array of distances in kilometers
+    """
+    if np.ndim(lat1) == 0 and np.ndim(lng1) == 0:
+        # One-to-many: use the shared kernel instead of broadcasting the query point
+        lats_rad = np.deg2rad(np.asarray(lat2, dtype=np.float64))
+        lngs_rad = np.deg2rad(np.asarray(lng2, dtype=np.float64))
+        lats_rad, lngs_rad = np.broadcast_arrays(lats_rad, lngs_rad)
+        return haversine_distance_radians(
+            float(lat1) * _DEG2RAD, float(lng1) * _DEG2RAD,
+            lats_rad.ravel(), lngs_rad.ravel(), np.cos(lats_rad.ravel()),
+        ).reshape(lats_rad.shape)
+
+    lat1_rad = np.deg2rad(lat1)
+    lat2_rad = np.deg2rad(lat2)
+    delta_lat = lat2_rad - lat1_rad
+    delta_lng = np.deg2rad(np.subtract(lng2, lng1))
+
+    a = (np.sin(delta_lat / 2) ** 2 +
+         np.cos(lat1_rad) * np.cos(lat2_rad) *
+         np.sin(delta_lng / 2) ** 2)
+
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    return EARTH_RADIUS_KM * c
+
+
+def haversine_distance_radians(
+    lat_rad: float,
+    lng_rad: float,
+    lats_rad: np.ndarray,
+    lngs_rad: np.ndarray,
+    cos_lats: np.ndarray,
+) -> np.ndarray:
+    """
+    One-to-many Haversine distance on targets already converted to radians.
+
+    Taking cos(lat) of the targets as an input lets callers with a fixed set
+    of targets (e.g. all locations) compute it once instead of per query.
+
+    Args:
+        lat_rad: Latitude of the query point in radians
+        lng_rad: Longitude of the query point in radians
+        lats_rad: Latitudes of the target points in radians
+        lngs_rad: Longitudes of the target points in radians
+        cos_lats: Precomputed cosine of lats_rad
+
+    Returns:
+        Array of distances in kilometers, one per target point, in the dtype
+        of lats_rad (float32 targets give float32 distances)
+    """
+    if njit is not None:
+        out = np.empty(lats_rad.shape[0], dtype=lats_rad.dtype)
+        _haversine_many(lat_rad, lng_rad, lats_rad, lngs_rad, cos_lats, out)
+        return out
+
+    a = (np.sin((lats_rad - lat_rad) / 2) ** 2 +
+         cos(lat_rad) * cos_lats * np.sin((lngs_rad - lng_rad) / 2) ** 2)
+
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+@_jit
+def _haversine_many(
+    lat_rad: float,
+    lng_rad: float,
+    lats_rad: np.ndarray,
+    lngs_rad: np.ndarray,
+    cos_lats: np.ndarray,
+    out: np.ndarray,
+) -> None:
+    """
+    Fused loop behind haversine_distance_radians when numba is installed.
+
+    Writes into out instead of allocating, and avoids the temporary arrays
+    the NumPy expression creates for each intermediate term.
+    """
+    cos_lat = cos(lat_rad)
+    for i in range(lats_rad.shape[0]):
+        sin_dlat = sin((lats_rad[i] - lat_rad) * 0.5)
+        sin_dlng = sin((lngs_rad[i] - lng_rad) * 0.5)
+        a = sin_dlat * sin_dlat + cos_lat * cos_lats[i] * sin_dlng * sin_dlng
+        out[i] = 2.0 * EARTH_RADIUS_KM * asin(sqrt(a))
+
+
+# Strict IEEE math so integer scores don't depend on whether numba is installed
+@_jit(fastmath=False)
 def calculate_score(distance_km: float) -> int:
     """
     Calculate score based on distance from guess to actual location.
@@ -52,10 +240,69 @@ def calculate_score(distance_km: float) -> int:
     Returns:
         Score (0-1000 points)
     """
-    if distance_km < 0:
-        distance_km = 0
-
-    max_distance = 20000.0
-    t = max(0.0, 1.0 - distance_km / max_distance)
+    # Clamp instead of branching: negative distances saturate at t = 1 (perfect)
+    t = min(1.0, max(0.0, 1.0 - distance_km / MAX_SCORE_DISTANCE_KM))
     score = 1000.0 * math.log(1.0 + t * (math.e - 1.0))
     return int(score)
+
+
+def _score_thresholds_km() -> np.ndarray:
+    """
+    Largest distance that still earns each score from 1000 down to 1.
+
+    Inverts the scoring curve once at import: a guess scores at least s points
+    when distance_km <= D * (1 - (exp(s / 1000) - 1) / (e - 1)). Each estimate
+    is then snapped to the exact float boundary of calculate_score, so the
+    table never disagrees with the scalar function.
+    Returned in ascending order (threshold for 1000 points first).
+    """
+    score = getattr(calculate_score, "py_func", calculate_score)  # un-jitted when numba is used
+    thresholds = []
+    for points in range(1000, 0, -1):
+        estimate = MAX_SCORE_DISTANCE_KM * (1.0 - math.expm1(points / 1000.0) / (math.e - 1.0))
+        # Bisect between a distance that scores >= points and one that doesn't
+        lo, hi = estimate - 1e-6, estimate + 1e-6
+        while True:
+            mid = (lo + hi) / 2
+            if mid in (lo, hi):
+                break
+            if score(mid) >= points:
+                lo = mid
+            else:
+                hi = mid
+        thresholds.append(lo)
+
+    return np.array(thresholds, dtype=np.float64)
+
+
+_SCORE_THRESHOLDS_KM = _score_thresholds_km()
+
+
+def calculate_score_vec(distances_km: np.ndarray) -> np.ndarray:
+    """
+    Vectorized calculate_score using the precomputed score thresholds.
+
+    Each score is the number of thresholds the distance falls within, found
+    with one binary search per element instead of evaluating the log curve.
+
+    Args:
+        distances_km: Distances in kilometers
+
+    Returns:
+        int16 array of scores (0-1000 points)
+    """
+    distances_km = np.asarray(distances_km, dtype=np.float64)
+    within = len(_SCORE_THRESHOLDS_KM) - np.searchsorted(
+        _SCORE_THRESHOLDS_KM, distances_km, side="left"
+    )
+    return within.astype(np.int16)
+
+
+def warm_up() -> None:
+    """Trigger JIT compilation up front so the first guess doesn't pay for it."""
+    haversine_distance(0.0, 0.0, 0.0, 0.0)
+    cosine_distance(0.0, 0.0, 0.0, 0.0)
+    for dtype in (np.float64, np.float32):
+        zero, one = np.zeros(1, dtype=dtype), np.ones(1, dtype=dtype)
+        haversine_distance_radians(dtype(0.0), dtype(0.0), zero, zero, one)
+    calculate_score(0.0)
@@ -0,0 +1,42 @@
+"""ETag helpers for HTTP response caching."""
+
+import hashlib
+
+
+def compute_etag(content: bytes) -> str:
+    """
+    Build a weak ETag from a response body.
+
+    Args:
+        content: Serialized response body
+
+    Returns:
+        Quoted weak ETag, e.g. W/"<hash>"
+    """
+    return f'W/"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Check whether an If-None-Match header matches the given ETag.
+
+    Uses weak comparison, so W/"x" and "x" are considered equal.
+
+    Args:
+        if_none_match: Raw If-None-Match header value, if present
+        etag: Current ETag of the resource
+
+    Returns:
+        True if the client's cached copy is still current
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque_tag
+        for candidate in if_none_match.split(",")
+    )
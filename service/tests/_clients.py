@@ -0,0 +1,22 @@
+"""Memoized requests for idempotent endpoints, shared across the test session."""
+
+from functools import lru_cache
+
+import httpx
+from fastapi.testclient import TestClient
+
+from global_news_map.main import app
+
+_CLIENT = TestClient(app)
+
+
+@lru_cache(maxsize=None)
+def cached_get(path: str) -> httpx.Response:
+    """
+    GET a path once per session and reuse the response.
+
+    Only use this for endpoints whose response never changes during a test run
+    (health, the static locations list); anything stateful should go through
+    the regular client fixture.
+    """
+    return _CLIENT.get(path)
@@ -0,0 +1,22 @@
+"""Shared pytest fixtures."""
+
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from global_news_map.main import app
+from global_news_map.services.locations import load_locations
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _load_test_locations():
+    """Load locations data once for the whole test session."""
+    data_path = str(Path(__file__).resolve().parents[1] / "data" / "locations.json")
+    load_locations(data_path)
+
+
+@pytest.fixture(scope="module")
+def client():
+    """Create test client, shared by the tests in a module."""
+    return TestClient(app)
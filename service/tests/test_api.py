@@ -1,35 +1,21 @@
-from pathlib import Path
+from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, patch
 
-import pytest
-from fastapi.testclient import TestClient
-
-from global_news_map.main import app
 from global_news_map.models.schemas import Headline
-from global_news_map.services.locations import load_locations
-
-
-@pytest.fixture(autouse=True)
-def _load_test_locations():
-    data_path = str(Path(__file__).resolve().parents[1] / "data" / "locations.json")
-    load_locations(data_path)
-
-
-@pytest.fixture
-def client():
-    return TestClient(app)
+from global_news_map.services import news
+from tests._clients import cached_get
 
 
-def test_health(client):
-    resp = client.get("/api/health")
+def test_health():
+    resp = cached_get("/api/health")
     assert resp.status_code == 200
     data = resp.json()
     assert data["status"] == "ok"
     assert data["version"] == "1.0.0"
 
 
-def test_list_locations(client):
-    resp = client.get("/api/locations")
+def test_list_locations():
+    resp = cached_get("/api/locations")
     assert resp.status_code == 200
     data = resp.json()
     assert len(data) == 118  # Expanded to 118 cities for better game variety
@@ -38,6 +24,17 @@ def test_list_locations(client):
     assert "tokyo" in ids
 
 
+def test_list_locations_cache_headers(client):
+    resp = cached_get("/api/locations")
+    assert resp.status_code == 200
+    assert resp.headers["cache-control"] == "public, max-age=86400"
+    etag = resp.headers["etag"]
+
+    cached = client.get("/api/locations", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+
 def test_get_news_unknown_location(client):
     resp = client.get("/api/news/atlantis")
     assert resp.status_code == 404
@@ -61,6 +58,53 @@ def test_get_news_success(mock_headlines, client):
     assert data["headlines"][0]["title"] == "Test headline"
 
 
+@patch("global_news_map.api.routes.get_headlines", new_callable=AsyncMock)
+def test_get_news_etag(mock_headlines, client):
+    mock_headlines.return_value = [
+        Headline(
+            title="Test headline",
+            source="TestSource",
+            published_at="2026-02-15T12:00:00Z",
+            url="https://example.com/article",
+            cached_at="2026-02-15T12:00:00Z",
+        )
+    ]
+    resp = client.get("/api/news/new-york")
+    assert resp.status_code == 200
+    assert resp.headers["cache-control"].startswith("public, max-age=")
+    etag = resp.headers["etag"]
+
+    cached = client.get("/api/news/new-york", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+    mock_headlines.return_value[0].title = "Updated headline"
+    refreshed = client.get("/api/news/new-york", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+
+
+@patch("global_news_map.api.routes.get_headlines", new_callable=AsyncMock)
+def test_get_news_max_age_is_remaining_ttl(mock_headlines, client):
+    fetched_at = datetime.now(timezone.utc) - timedelta(seconds=600)
+    mock_headlines.return_value = [
+        Headline(
+            title="Test headline",
+            source="TestSource",
+            published_at="2026-02-15T12:00:00Z",
+            url="https://example.com/article",
+            cached_at=fetched_at,
+        )
+    ]
+    resp = client.get("/api/news/new-york")
+    max_age = int(resp.headers["cache-control"].removeprefix("public, max-age="))
+    assert news._CACHE_TTL_SECONDS - 605 <= max_age <= news._CACHE_TTL_SECONDS - 600
+
+    # Entries past their TTL must not be cached downstream at all
+    mock_headlines.return_value[0].cached_at = fetched_at - timedelta(days=1)
+    resp = client.get("/api/news/new-york")
+    assert resp.headers["cache-control"] == "public, max-age=0"
+
+
 @patch("global_news_map.api.routes.get_headlines", new_callable=AsyncMock)
 def test_get_news_unavailable(mock_headlines, client):
     mock_headlines.return_value = None
@@ -1,8 +1,16 @@
 """Tests for distance calculation utilities."""
 
+import numpy as np
 import pytest
 
-from global_news_map.utils.distance import calculate_score, haversine_distance
+from global_news_map.utils.distance import (
+    _haversine_many,
+    calculate_score,
+    calculate_score_vec,
+    cosine_distance,
+    haversine_distance,
+    haversine_distance_batch,
+)
 
 
 def test_haversine_nyc_to_london():
@@ -27,6 +35,75 @@ def test_haversine_tokyo_to_sydney():
     assert 7800 < distance < 7850, f"Expected ~7820km, got {distance:.1f}km"
 
 
+def test_cosine_distance_matches_haversine():
+    """The law-of-cosines fast path should agree with Haversine to well under a km."""
+    pairs = [
+        (40.7128, -74.006, 51.5074, -0.1278),
+        (35.6762, 139.6503, -33.8688, 151.2093),
+        (40.7128, -74.006, 40.7128, -74.006),
+        (0.0, 0.0, 0.0, 179.9),
+    ]
+    for lat1, lng1, lat2, lng2 in pairs:
+        expected = haversine_distance(lat1, lng1, lat2, lng2)
+        assert cosine_distance(lat1, lng1, lat2, lng2) == pytest.approx(expected, abs=0.01)
+
+
+def test_cosine_distance_same_point_is_zero():
+    """Identical points must be exactly 0 km apart, at any latitude."""
+    for lat in np.linspace(-89.9, 89.9, 1000):
+        assert cosine_distance(lat, 12.34, lat, 12.34) == 0.0
+
+
+def test_haversine_batch_matches_scalar():
+    """Batch results should match the scalar implementation pair by pair."""
+    lat1 = np.array([40.7128, 35.6762, 40.7128])
+    lng1 = np.array([-74.006, 139.6503, -74.006])
+    lat2 = np.array([51.5074, -33.8688, 40.7128])
+    lng2 = np.array([-0.1278, 151.2093, -74.006])
+
+    distances = haversine_distance_batch(lat1, lng1, lat2, lng2)
+
+    expected = [haversine_distance(*args) for args in zip(lat1, lng1, lat2, lng2)]
+    assert distances == pytest.approx(expected)
+
+
+def test_haversine_batch_broadcasts_single_point():
+    """A single point can be compared against many points."""
+    lats = np.array([51.5074, -33.8688])
+    lngs = np.array([-0.1278, 151.2093])
+
+    distances = haversine_distance_batch(40.7128, -74.006, lats, lngs)
+
+    assert distances.shape == (2,)
+    assert 5550 < distances[0] < 5600
+
+
+def test_haversine_batch_one_to_many_matches_scalar():
+    """One-to-many distances should match the scalar implementation."""
+    lats = np.array([51.5074, -33.8688, 40.7128])
+    lngs = np.array([-0.1278, 151.2093, -74.006])
+
+    distances = haversine_distance_batch(40.7128, -74.006, lats, lngs)
+
+    expected = [haversine_distance(40.7128, -74.006, lat, lng) for lat, lng in zip(lats, lngs)]
+    assert distances == pytest.approx(expected, abs=1e-6)
+
+
+def test_haversine_many_matches_scalar():
+    """The fused kernel should match the scalar implementation."""
+    lats = np.radians([51.5074, -33.8688, 40.7128, -90.0])
+    lngs = np.radians([-0.1278, 151.2093, -74.006, 0.0])
+    out = np.empty(4)
+
+    _haversine_many(np.radians(40.7128), np.radians(-74.006), lats, lngs, np.cos(lats), out)
+
+    expected = [
+        haversine_distance(40.7128, -74.006, lat, lng)
+        for lat, lng in zip(np.degrees(lats), np.degrees(lngs))
+    ]
+    assert out == pytest.approx(expected, abs=1e-6)
+
+
 def test_score_perfect_guess():
     """Perfect guess (0 km) should score 1000 points."""
     score = calculate_score(0)
@@ -56,3 +133,16 @@ def test_score_negative_distance():
     """Negative distance should be treated as 0."""
     score = calculate_score(-100)
     assert score == 1000
+
+
+def test_score_vec_matches_scalar():
+    """Vectorized scores should equal calculate_score for every distance."""
+    distances = np.concatenate([
+        np.linspace(-100, 25000, 20001),
+        [0.0, 100.0, 10000.0, 19999.999, 20000.0, 50000.0],
+    ])
+
+    scores = calculate_score_vec(distances)
+
+    assert scores.dtype == np.int16
+    assert scores.tolist() == [calculate_score(float(d)) for d in distances]
@@ -1,25 +1,14 @@
 """Tests for game API endpoints."""
 
-from pathlib import Path
+import asyncio
+from datetime import datetime, timedelta, timezone
 
+import fakeredis
 import pytest
-from fastapi.testclient import TestClient
 
-from global_news_map.main import app
-from global_news_map.services.locations import load_locations
-
-
-@pytest.fixture(autouse=True)
-def _load_test_locations():
-    """Load locations data before running tests."""
-    data_path = str(Path(__file__).resolve().parents[1] / "data" / "locations.json")
-    load_locations(data_path)
-
-
-@pytest.fixture
-def client():
-    """Create test client."""
-    return TestClient(app)
+from global_news_map.models.schemas import GameRound, GameSession, GuessRequest
+from global_news_map.services import game as game_service
+from global_news_map.services.locations import get_all_locations
 
 
 def test_game_start_creates_session(client):
@@ -185,3 +174,212 @@ def test_completed_game_submission(client):
     )
     assert resp_extra.status_code == 400
     assert "completed" in resp_extra.json()["detail"].lower()
+
+
+def _make_session(game_id, age, num_rounds=1):
+    return GameSession(
+        game_id=game_id,
+        rounds=[
+            GameRound(round_number=number, headline_title="Headline", location_id="tokyo")
+            for number in range(1, num_rounds + 1)
+        ],
+        current_round_index=0,
+        total_score=0,
+        created_at=datetime.now(timezone.utc) - age,
+    )
+
+
+async def test_cleanup_removes_only_expired_sessions(monkeypatch):
+    """Verify sessions older than the TTL are dropped and fresh ones are kept."""
+    monkeypatch.setattr(game_service, "_game_sessions", {})
+    monkeypatch.setattr(game_service, "_expiry_heap", [])
+
+    await game_service._store_new_session(_make_session("expired-game", timedelta(hours=2)))
+    await game_service._store_new_session(_make_session("fresh-game", timedelta(minutes=5)))
+
+    assert "expired-game" not in game_service._game_sessions
+    assert "fresh-game" in game_service._game_sessions
+
+
+async def test_session_store_evicts_oldest_when_full(monkeypatch):
+    """Verify the in-memory store stays within capacity by dropping the oldest games."""
+    monkeypatch.setattr(game_service.settings, "max_game_sessions", 2)
+    monkeypatch.setattr(game_service, "_game_sessions", {})
+    monkeypatch.setattr(game_service, "_expiry_heap", [])
+
+    await game_service._store_new_session(_make_session("oldest-game", timedelta(minutes=30)))
+    await game_service._store_new_session(_make_session("older-game", timedelta(minutes=20)))
+    await game_service._store_new_session(_make_session("newest-game", timedelta(minutes=10)))
+
+    assert set(game_service._game_sessions) == {"older-game", "newest-game"}
+
+
+def test_session_encoding_round_trips():
+    """Verify sessions stored in Redis decode back to an equal session."""
+    session = _make_session("encoded-game", timedelta(minutes=5))
+    session.rounds[0].guess_lat = 35.0
+    session.rounds[0].score = 990
+
+    assert game_service._decode_session(game_service._encode_session(session)) == session
+
+
+def test_weighted_sample_returns_distinct_items():
+    """Verify weighted sampling never repeats a location and respects k."""
+    population = list(range(10))
+    weights = [0.1] * 9 + [0.9]
+
+    sample = game_service._weighted_sample(population, weights, 5)
+
+    assert len(sample) == 5
+    assert len(set(sample)) == 5
+
+
+def test_perfect_guess_scores_1000_at_every_location():
+    """Verify guessing a city's exact coordinates gives 0 km and full marks everywhere."""
+    for location in get_all_locations():
+        session = _make_session("perfect-game", timedelta(minutes=5))
+        session.rounds[0].location_id = location.location_id
+
+        response = game_service._apply_guess(
+            "perfect-game", session, GuessRequest(lat=location.lat, lng=location.lng)
+        )
+
+        assert response.distance_km == 0.0, location.location_id
+        assert response.round_score == 1000, location.location_id
+
+
+def test_new_game_id_is_short_and_unique():
+    """Verify game ids are compact base62 strings that don't repeat."""
+    ids = {game_service._new_game_id() for _ in range(1000)}
+
+    assert len(ids) == 1000
+    assert all(0 < len(game_id) <= 17 and game_id.isalnum() for game_id in ids)
+
+
+@pytest.fixture
+def redis_server(monkeypatch):
+    """Route game sessions through an in-process fake Redis."""
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(game_service, "_redis", fakeredis.FakeAsyncRedis(server=server))
+    return server
+
+
+async def test_redis_session_round_trips(redis_server):
+    """Verify a session stored in Redis loads back unchanged with the session TTL."""
+    session = _make_session("redis-game", timedelta(minutes=5), num_rounds=5)
+
+    await game_service._store_new_session(session)
+
+    assert await game_service._load_session("redis-game") == session
+    ttl = await game_service._redis.ttl("game:redis-game")
+    assert 0 < ttl <= game_service.SESSION_TTL_SECONDS
+
+
+async def test_redis_concurrent_guesses_score_each_round_once(redis_server):
+    """Verify concurrent guesses advance through rounds without scoring one twice."""
+    await game_service._store_new_session(
+        _make_session("redis-game", timedelta(minutes=5), num_rounds=5)
+    )
+    guess = GuessRequest(lat=0, lng=0)
+
+    responses = await asyncio.gather(
+        *(game_service.submit_guess("redis-game", guess) for _ in range(3))
+    )
+
+    assert sorted(r.current_round_number for r in responses) == [1, 2, 3]
+    session = await game_service._load_session("redis-game")
+    assert session.current_round_index == 3
+    assert session.total_score == sum(r.round_score for r in responses)
+    # Guesses must not reset the session's expiry
+    assert await game_service._redis.ttl("game:redis-game") > 0
+
+
+def _conflicting_writes(monkeypatch, redis_server, conflicts):
+    """Make another client rewrite the session right after each WATCH, `conflicts` times."""
+    client = game_service._redis
+    other = fakeredis.FakeAsyncRedis(server=redis_server)
+    create_pipeline = client.pipeline
+
+    def pipeline(*args, **kwargs):
+        pipe = create_pipeline(*args, **kwargs)
+        watch = pipe.watch
+
+        async def watch_then_conflict(*keys):
+            nonlocal conflicts
+            await watch(*keys)
+            if conflicts > 0:
+                conflicts -= 1
+                await other.set(keys[0], await other.get(keys[0]), keepttl=True)
+
+        pipe.watch = watch_then_conflict
+        return pipe
+
+    monkeypatch.setattr(client, "pipeline", pipeline)
+
+
+async def test_redis_guess_retries_after_conflict(redis_server, monkeypatch):
+    """Verify a guess whose transaction was interrupted is retried against fresh state."""
+    await game_service._store_new_session(
+        _make_session("redis-game", timedelta(minutes=5), num_rounds=5)
+    )
+    _conflicting_writes(monkeypatch, redis_server, conflicts=2)
+
+    response = await game_service.submit_guess("redis-game", GuessRequest(lat=0, lng=0))
+
+    assert response.current_round_number == 1
+    session = await game_service._load_session("redis-game")
+    assert session.current_round_index == 1
+
+
+async def test_redis_guess_gives_up_after_repeated_conflicts(redis_server, monkeypatch):
+    """Verify a guess fails cleanly once every attempt has been interrupted."""
+    await game_service._store_new_session(
+        _make_session("redis-game", timedelta(minutes=5), num_rounds=5)
+    )
+    _conflicting_writes(monkeypatch, redis_server, conflicts=game_service._MAX_GUESS_ATTEMPTS)
+
+    with pytest.raises(ValueError, match="retry"):
+        await game_service.submit_guess("redis-game", GuessRequest(lat=0, lng=0))
+
+    session = await game_service._load_session("redis-game")
+    assert session.current_round_index == 0
+
+
+@pytest.fixture(params=["memory", "redis"])
+def session_store(request, monkeypatch):
+    """Run a test against both the in-memory and the Redis session store."""
+    monkeypatch.setattr(game_service, "_game_sessions", {})
+    monkeypatch.setattr(game_service, "_expiry_heap", [])
+    if request.param == "redis":
+        request.getfixturevalue("redis_server")
+    return request.param
+
+
+async def test_submit_guesses_batch(client, session_store):
+    """Verify a batch scores consecutive rounds and an oversized batch changes nothing."""
+    await game_service._store_new_session(
+        _make_session("batch-game", timedelta(minutes=5), num_rounds=5)
+    )
+    guess = {"lat": 0, "lng": 0}
+
+    first = client.post("/api/game/batch-game/guess", json=guess)
+    assert first.status_code == 200
+
+    too_many = client.post("/api/game/batch-game/guesses", json=[guess] * 5)
+    assert too_many.status_code == 400
+    session = await game_service._load_session("batch-game")
+    assert session.current_round_index == 1
+    assert session.total_score == first.json()["round_score"]
+
+    batch_resp = client.post("/api/game/batch-game/guesses", json=[guess] * 4)
+    assert batch_resp.status_code == 200
+
+    data = batch_resp.json()
+    assert [item["current_round_number"] for item in data] == [2, 3, 4, 5]
+    assert [item["is_final_round"] for item in data] == [False, False, False, True]
+    expected_total = first.json()["round_score"] + sum(item["round_score"] for item in data)
+    assert data[-1]["total_score"] == expected_total
+
+    session = await game_service._load_session("batch-game")
+    assert session.completed
+    assert session.total_score == expected_total
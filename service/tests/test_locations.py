@@ -0,0 +1,64 @@
+"""Tests for the locations service."""
+
+from pathlib import Path
+
+import pytest
+
+from global_news_map.services.locations import (
+    get_all_locations,
+    get_distances_from,
+    load_locations,
+    nearest_locations,
+)
+from global_news_map.utils.distance import haversine_distance
+
+
+def test_distances_from_matches_scalar_haversine():
+    """Vectorized distances to every location should match the scalar formula."""
+    distances = get_distances_from(40.7128, -74.006)
+
+    locations = get_all_locations()
+    assert distances.shape == (len(locations),)
+    expected = [haversine_distance(40.7128, -74.006, loc.lat, loc.lng) for loc in locations]
+    # Location arrays are float32, which is good to tens of meters at Earth scale
+    assert distances == pytest.approx(expected, abs=0.05)
+
+
+def test_distances_from_closest_is_self():
+    """A point on a city should be closest to that city."""
+    tokyo = next(loc for loc in get_all_locations() if loc.location_id == "tokyo")
+
+    distances = get_distances_from(tokyo.lat, tokyo.lng)
+
+    assert get_all_locations()[int(distances.argmin())].location_id == "tokyo"
+    assert distances.min() < 0.01
+
+
+def test_nearest_locations_sorted_by_distance():
+    """Nearest locations should start with the city itself and grow farther away."""
+    tokyo = next(loc for loc in get_all_locations() if loc.location_id == "tokyo")
+
+    nearest = nearest_locations(tokyo.lat, tokyo.lng, k=3)
+
+    assert len(nearest) == 3
+    assert nearest[0][0].location_id == "tokyo"
+    distances = [distance for _, distance in nearest]
+    assert distances == sorted(distances)
+    assert sorted(get_distances_from(tokyo.lat, tokyo.lng))[:3] == pytest.approx(distances)
+
+
+def test_load_locations_skips_unchanged_file():
+    """Reloading the same unmodified file should reuse the loaded locations."""
+    data_path = str(Path(__file__).resolve().parents[1] / "data" / "locations.json")
+    before = get_all_locations()
+
+    assert load_locations(data_path) is before
+
+
+def test_load_locations_skips_equivalent_path():
+    """A different spelling of the same file should also reuse the loaded locations."""
+    tests_dir = Path(__file__).resolve().parent
+    data_path = str(tests_dir / ".." / "data" / "locations.json")
+    before = get_all_locations()
+
+    assert load_locations(data_path) is before
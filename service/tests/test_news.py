@@ -0,0 +1,268 @@
+"""Tests for the news service cache."""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import fakeredis
+import httpx
+import pytest
+
+from global_news_map.models.schemas import Headline, Location
+from global_news_map.services import news
+
+
+@pytest.fixture
+def fake_redis():
+    client = fakeredis.FakeAsyncRedis()
+    news._cache.clear()
+    news._attempt_count.clear()
+    news._success_count.clear()
+    news.set_redis_client(client)
+    yield client
+    news.set_redis_client(None)
+    news._cache.clear()
+
+
+def _headlines():
+    return [
+        Headline(
+            title="Test headline",
+            source="TestSource",
+            published_at="2026-02-15T12:00:00Z",
+            url="https://example.com/article",
+            cached_at=datetime.now(timezone.utc),
+        )
+    ]
+
+
+async def test_set_cache_writes_to_redis(fake_redis):
+    await news._set_cache("new-york", _headlines())
+
+    assert await fake_redis.exists("news:new-york")
+    assert await fake_redis.ttl("news:new-york") == pytest.approx(news._CACHE_TTL_SECONDS, abs=1)
+
+
+async def test_get_cached_falls_back_to_redis(fake_redis):
+    await news._set_cache("new-york", _headlines())
+    news._cache.clear()
+
+    cached = await news._get_cached("new-york")
+    assert cached is not None
+    assert cached[0].title == "Test headline"
+    # Redis hit repopulates the in-process cache
+    assert "new-york" in news._cache
+
+
+@pytest.mark.parametrize("payload", [b"not json", b'[{"title": "missing fields"}]'])
+async def test_get_headlines_refetches_over_unreadable_redis_entry(fake_redis, payload):
+    await fake_redis.setex("news:tokyo", 600, payload)
+
+    assert await news._get_cached("tokyo") is None
+    assert not await fake_redis.exists("news:tokyo")
+
+    with patch.object(news, "_fetch_first_available", new_callable=AsyncMock) as mock_fetch:
+        mock_fetch.return_value = _headlines()
+        headlines = await news.get_headlines("tokyo", "Tokyo", "Japan")
+
+    assert headlines[0].title == "Test headline"
+
+
+async def test_get_cached_miss(fake_redis):
+    assert await news._get_cached("atlantis") is None
+
+
+RSS_FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+  <channel>
+    <title>Tokyo Japan - Google News</title>
+    <item>
+      <title>Tokyo markets rally &amp; close higher</title>
+      <link>https://news.google.com/articles/1</link>
+      <pubDate>Sun, 15 Feb 2026 12:00:00 GMT</pubDate>
+      <source url="https://example.com">Example Times</source>
+    </item>
+    <item>
+      <title>Second headline</title>
+      <link>https://news.google.com/articles/2</link>
+      <pubDate>Sun, 15 Feb 2026 11:00:00 GMT</pubDate>
+    </item>
+  </channel>
+</rss>
+"""
+
+
+@patch("global_news_map.services.news._http_get", new_callable=AsyncMock)
+async def test_fetch_from_google_rss_parses_items(mock_get):
+    mock_get.return_value = httpx.Response(200, content=RSS_FEED)
+
+    headlines = await news.fetch_from_google_rss("Tokyo", "Japan")
+
+    assert len(headlines) == 2
+    assert headlines[0].title == "Tokyo markets rally & close higher"
+    assert headlines[0].source == "Example Times"
+    assert headlines[0].url == "https://news.google.com/articles/1"
+    assert headlines[0].published_at == "Sun, 15 Feb 2026 12:00:00 GMT"
+    assert headlines[1].source == "Google News"
+
+
+@patch("global_news_map.services.news._http_get", new_callable=AsyncMock)
+async def test_fetch_from_google_rss_empty_feed(mock_get):
+    mock_get.return_value = httpx.Response(
+        200, content=b"<rss><channel><title>Empty</title></channel></rss>"
+    )
+
+    assert await news.fetch_from_google_rss("Atlantis", "Nowhere") is None
+
+
+@patch("global_news_map.services.news._http_get", new_callable=AsyncMock)
+async def test_fetch_from_google_rss_invalid_xml(mock_get):
+    mock_get.return_value = httpx.Response(200, content=b"<html><body>Oops")
+
+    assert await news.fetch_from_google_rss("Tokyo", "Japan") is None
+
+
+async def test_get_headlines_skips_newsapi_by_default(fake_redis):
+    with (
+        patch.object(news, "fetch_from_newsapi", new_callable=AsyncMock) as mock_newsapi,
+        patch.object(news, "fetch_from_google_rss", new_callable=AsyncMock) as mock_rss,
+    ):
+        mock_rss.return_value = _headlines()
+        headlines = await news.get_headlines("tokyo", "Tokyo", "Japan")
+
+    assert headlines == mock_rss.return_value
+    mock_newsapi.assert_not_called()
+
+
+async def test_get_headlines_returns_first_non_empty_source(fake_redis, monkeypatch):
+    monkeypatch.setattr(news.settings, "race_news_sources", True)
+
+    async def slow_newsapi(city, country):
+        await asyncio.sleep(10)
+        return _headlines()
+
+    with (
+        patch.object(news, "fetch_from_newsapi", side_effect=slow_newsapi),
+        patch.object(news, "fetch_from_google_rss", new_callable=AsyncMock) as mock_rss,
+    ):
+        mock_rss.return_value = _headlines()
+        headlines = await asyncio.wait_for(news.get_headlines("tokyo", "Tokyo", "Japan"), 1)
+
+    assert headlines == mock_rss.return_value
+
+
+async def test_get_headlines_falls_back_when_one_source_is_empty(fake_redis, monkeypatch):
+    monkeypatch.setattr(news.settings, "race_news_sources", True)
+
+    with (
+        patch.object(news, "fetch_from_newsapi", new_callable=AsyncMock) as mock_newsapi,
+        patch.object(news, "fetch_from_google_rss", new_callable=AsyncMock) as mock_rss,
+    ):
+        mock_newsapi.side_effect = httpx.ConnectTimeout("timed out")
+        mock_rss.return_value = _headlines()
+        headlines = await news.get_headlines("tokyo", "Tokyo", "Japan")
+
+    assert headlines == mock_rss.return_value
+
+
+async def test_concurrent_misses_share_one_fetch(fake_redis):
+    calls = 0
+
+    async def slow_fetch(city, country):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return _headlines()
+
+    with patch.object(news, "_fetch_first_available", side_effect=slow_fetch):
+        results = await asyncio.gather(
+            *(news.get_headlines("tokyo", "Tokyo", "Japan") for _ in range(5))
+        )
+
+    assert calls == 1
+    assert all(result == results[0] for result in results)
+    assert news._inflight == {}
+
+
+async def test_cancelled_caller_does_not_cancel_shared_fetch(fake_redis):
+    async def slow_fetch(city, country):
+        await asyncio.sleep(0.05)
+        return _headlines()
+
+    with patch.object(news, "_fetch_first_available", side_effect=slow_fetch):
+        leader = asyncio.create_task(news.get_headlines("tokyo", "Tokyo", "Japan"))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(news.get_headlines("tokyo", "Tokyo", "Japan"))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        headlines = await waiter
+
+    assert leader.cancelled()
+    assert headlines[0].title == "Test headline"
+    assert "tokyo" in news._cache
+
+
+async def test_failed_fetch_is_not_shared_afterwards(fake_redis):
+    with patch.object(news, "_fetch_first_available", new_callable=AsyncMock) as mock_fetch:
+        mock_fetch.side_effect = [RuntimeError("upstream down"), _headlines()]
+
+        with pytest.raises(RuntimeError):
+            await news.get_headlines("tokyo", "Tokyo", "Japan")
+        headlines = await news.get_headlines("tokyo", "Tokyo", "Japan")
+
+    assert headlines[0].title == "Test headline"
+    assert mock_fetch.call_count == 2
+
+
+async def test_prewarm_cache_fetches_every_location(fake_redis):
+    locations = [
+        Location(location_id="tokyo", city="Tokyo", country="Japan", lat=35.7, lng=139.7,
+                 timezone="Asia/Tokyo"),
+        Location(location_id="lima", city="Lima", country="Peru", lat=-12.0, lng=-77.0,
+                 timezone="America/Lima"),
+    ]
+    with patch.object(news, "_fetch_first_available", new_callable=AsyncMock) as mock_fetch:
+        mock_fetch.side_effect = [_headlines(), None]
+        warmed = await news.prewarm_cache(locations)
+
+    assert warmed == 1
+    assert "tokyo" in news._cache
+    assert "lima" not in news._cache
+
+
+async def test_prewarm_refresh_only_fetches_expiring_entries(fake_redis):
+    locations = [
+        Location(location_id="tokyo", city="Tokyo", country="Japan", lat=35.7, lng=139.7,
+                 timezone="Asia/Tokyo"),
+        Location(location_id="lima", city="Lima", country="Peru", lat=-12.0, lng=-77.0,
+                 timezone="America/Lima"),
+    ]
+    await news._set_cache("tokyo", _headlines())
+    # Cached by another worker and about to expire
+    await fake_redis.setex("news:lima", 60, news._headlines_adapter.dump_json(_headlines()))
+
+    with patch.object(news, "_fetch_first_available", new_callable=AsyncMock) as mock_fetch:
+        mock_fetch.return_value = _headlines()
+        warmed = await news.prewarm_cache(locations, refresh_within=600)
+
+    assert warmed == 2
+    mock_fetch.assert_awaited_once_with("Lima", "Peru")
+    assert await fake_redis.ttl("news:lima") > 600
+
+
+async def test_only_one_worker_claims_a_cache_pass(fake_redis):
+    assert await news._claim_cache_pass()
+    assert not await news._claim_cache_pass()
+
+
+async def test_fetch_success_rates(fake_redis):
+    with patch.object(news, "_fetch_first_available", new_callable=AsyncMock) as mock_fetch:
+        mock_fetch.side_effect = [_headlines(), None]
+        await news.get_headlines("tokyo", "Tokyo", "Japan")
+        await news.get_headlines("lima", "Lima", "Peru")
+
+    tokyo, lima, unknown = await news.get_fetch_success_rates(["tokyo", "lima", "atlantis"])
+
+    assert tokyo > unknown > lima
+    assert unknown == 0.5